@@ -1,12 +1,14 @@
 
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 import folium
 from folium import CircleMarker
-from streamlit_folium import st_folium
 import plotly.express as px
-from src.api import fetch_sismos, filter_sismos
+from statsmodels.nonparametric.smoothers_lowess import lowess
+from src.api import add_dia_hora, fetch_sismos, filter_sismos
 
 st.set_page_config(page_title="Sismos Chile • Solemne II", page_icon="🌎", layout="wide")
 st.title("🌎 Análisis de Sismos en Chile - Solemne II")
@@ -22,15 +24,85 @@ with st.sidebar:
     mostrar_mapa = st.checkbox("Mostrar mapa", value=True)
     evtdb_pages = st.slider("Número de páginas EVTDB", min_value=1, max_value=5, value=2)
 
+_PALETA = np.array(["#777777", "#4CAF50", "#FFC107", "#FF9800", "#E53935"])
+_CORTES = {"profundidad": ([35, 70, 300], [1, 2, 3, 4]), "magnitud": ([3, 5], [1, 3, 4])}
+
+def _colores(v: np.ndarray, modo: str) -> np.ndarray:
+    cortes, idx = _CORTES[modo]
+    k = np.asarray(idx, dtype=np.uint8)[np.digitize(v, cortes)]
+    return _PALETA[np.where(np.isnan(v), 0, k)]
+
+MAX_MARCADORES = 500
+
+def _submuestrear(puntos: pd.DataFrame) -> pd.DataFrame:
+    # keep only the strongest event per 0.1° x 0.1° cell
+    if len(puntos) <= MAX_MARCADORES:
+        return puntos
+    lat_bin = np.round(puntos['latitud'].to_numpy(dtype=float) * 10).astype(np.int64)
+    lon_bin = np.round(puntos['longitud'].to_numpy(dtype=float) * 10).astype(np.int64)
+    key = lat_bin * 10000 + lon_bin
+    order = np.argsort(-puntos['magnitud'].to_numpy(dtype=float, na_value=-np.inf), kind='stable')
+    keep = order[~pd.Series(key[order]).duplicated().to_numpy()]
+    return puntos.iloc[np.sort(keep)]
+
 @st.cache_data(ttl=300, show_spinner=True)
 def load_data(pages: int):
     return fetch_sismos(evtdb_pages=pages)
 
+TABLA_COLS = ['fecha_local', 'magnitud', 'profundidad', 'latitud', 'longitud', 'referencia']
+
+@st.cache_data(show_spinner=False)
+def _tabla_arrow(df: pd.DataFrame) -> pa.Table:
+    return pa.Table.from_pandas(df[TABLA_COLS], preserve_index=False)
+
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(df: pd.DataFrame) -> bytes:
+    return df.to_csv(index=False).encode("utf-8")
+
+@st.cache_data(show_spinner=False)
+def _tendencia(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    return lowess(y, x, frac=2 / 3, is_sorted=True, return_sorted=False)
+
+@st.cache_data(show_spinner=False)
+def _mapa_html(puntos: pd.DataFrame, radius: int, color_mode: str) -> str:
+    center = [puntos['latitud'].mean(), puntos['longitud'].mean()]
+    if not (np.isfinite(center[0]) and np.isfinite(center[1])):
+        center = [-33.45, -70.66]
+    m = folium.Map(location=center, zoom_start=4, tiles="OpenStreetMap", prefer_canvas=True)
+    capa = folium.FeatureGroup(name="Sismos")
+
+    colors = _colores(puntos[color_mode].to_numpy(dtype=float, na_value=np.nan), color_mode)
+
+    for lat, lon, mag, prof, fecha, ref, col in zip(
+        puntos['latitud'].to_numpy(), puntos['longitud'].to_numpy(),
+        puntos['magnitud'].to_numpy(), puntos['profundidad'].to_numpy(),
+        puntos['fecha_local'].to_numpy(), puntos['referencia'].to_numpy(), colors,
+    ):
+        popup = (
+            f"<b>Mag:</b> {mag} • <b>Prof:</b> {prof} km<br>"
+            f"<b>Fecha:</b> {fecha}<br>"
+            f"<b>Ref:</b> {ref}"
+        )
+        CircleMarker(
+            location=[lat, lon],
+            radius=radius,
+            color=col,
+            fill=True,
+            fill_color=col,
+            fill_opacity=0.7
+        ).add_child(folium.Popup(popup, max_width=350)).add_to(capa)
+    capa.add_to(m)
+    return m.get_root().render()
+
 try:
     df = load_data(evtdb_pages)
 except Exception as e:
     st.error(f"⚠️ No fue posible cargar datos: {e}")
     st.stop()
+if df.attrs.get("stale"):
+    st.warning("⚠️ Fuentes no disponibles: se muestran los últimos datos obtenidos.")
+if df.attrs.get("partial"):
+    load_data.clear()  # some sources were still loading; don't pin this merge for the full ttl
 
 for _col in ['latitud', 'longitud', 'magnitud', 'profundidad', 'fecha_dt', 'fecha_local', 'referencia']:
     if _col not in df.columns:
@@ -60,52 +132,26 @@ elif dff.empty:
 elif valid_map.empty:
     st.info("Hay datos, pero ninguno trae coordenadas para el mapa.")
 else:
-    center = [valid_map['latitud'].mean(), valid_map['longitud'].mean()]
-    if not (np.isfinite(center[0]) and np.isfinite(center[1])):
-        center = [-33.45, -70.66]
-    m = folium.Map(location=center, zoom_start=4, tiles="OpenStreetMap")
-
-    def color_for(r):
-        if color_mode == "profundidad":
-            v = r['profundidad']
-            if v is None or pd.isna(v): return "#777777"
-            if v < 35: return "#4CAF50"
-            if v < 70: return "#FFC107"
-            if v < 300: return "#FF9800"
-            return "#E53935"
-        else:
-            mval = r['magnitud']
-            if mval is None or pd.isna(mval): return "#777777"
-            if mval < 3: return "#4CAF50"
-            if mval < 5: return "#FF9800"
-            return "#E53935"
-
-    for _, r in valid_map.iterrows():
-        popup = (
-            f"<b>Mag:</b> {r.get('magnitud')} • <b>Prof:</b> {r.get('profundidad')} km<br>"
-            f"<b>Fecha:</b> {r.get('fecha_local')}<br>"
-            f"<b>Ref:</b> {r.get('referencia','')}"
-        )
-        CircleMarker(
-            location=[r['latitud'], r['longitud']],
-            radius=radius,
-            color=color_for(r),
-            fill=True,
-            fill_color=color_for(r),
-            fill_opacity=0.7
-        ).add_child(folium.Popup(popup, max_width=350)).add_to(m)
-
-    st_folium(m, height=520, use_container_width=True)
+    puntos = _submuestrear(valid_map)
+    if len(puntos) < len(valid_map):
+        st.caption(f"Mostrando {len(puntos)} de {len(valid_map)} eventos (el de mayor magnitud por celda de 0.1°).")
+    components.html(_mapa_html(puntos, radius, color_mode), height=520)
 
 st.subheader("📈 Tendencias")
 if not dff.empty:
-    daily = dff.groupby('dia').agg(eventos=('magnitud','count'), mag_prom=('magnitud','mean')).reset_index()
+    daily = (add_dia_hora(dff).groupby('dia', sort=False)['magnitud'].agg(['count', 'mean'])
+             .rename(columns={'count': 'eventos', 'mean': 'mag_prom'}).reset_index().sort_values('dia'))
     st.plotly_chart(px.bar(daily, x='dia', y='eventos', title="Eventos por día"), use_container_width=True)
-    st.plotly_chart(px.scatter(dff, x='fecha_local', y='magnitud', trendline='lowess', title="Magnitud vs tiempo", hover_data=['referencia']), use_container_width=True)
+    fig = px.scatter(dff, x='fecha_local', y='magnitud', title="Magnitud vs tiempo", hover_data=['referencia'])
+    tend = dff[['fecha_local', 'magnitud']].dropna().sort_values('fecha_local')
+    if len(tend) > 1:
+        y_fit = _tendencia(tend['fecha_local'].astype('int64').to_numpy(), tend['magnitud'].to_numpy(dtype=float))
+        fig.add_scatter(x=tend['fecha_local'], y=y_fit, mode='lines', name='LOWESS', showlegend=False)
+    st.plotly_chart(fig, use_container_width=True)
 
 st.subheader("🧮 Tabla de datos")
-st.dataframe(dff[['fecha_local','magnitud','profundidad','latitud','longitud','referencia']])
-st.download_button("⬇️ Descargar CSV filtrado", data=dff.to_csv(index=False).encode("utf-8"), file_name="sismos_filtrados.csv", mime="text/csv")
+st.dataframe(_tabla_arrow(dff), use_container_width=True)
+st.download_button("⬇️ Descargar CSV filtrado", data=_to_csv_bytes(dff), file_name="sismos_filtrados.csv", mime="text/csv")
 
 st.markdown("---")
 st.caption("Proyecto Solemne II • Ingeniería USS • Hecho con Streamlit, Pandas, Folium y Plotly")
@@ -1,23 +1,103 @@
 
 from __future__ import annotations
-import re, requests
+import html, io, os, re, tempfile, time
 import pandas as pd
 import numpy as _np
 from typing import Optional
-from bs4 import BeautifulSoup
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+import lxml.html
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 import datetime as _dt
+from pathlib import Path
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
 
 CHILEALERTA_ENDPOINT = "https://chilealerta.com/api/query"
 GAEL_ENDPOINT = "https://api.gael.cloud/general/public/sismos"
 
+# per-user and private: both caches are deserialized on read, so never share them via /tmp
+DISK_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "sismos-solemne"
+try:
+    DISK_CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+except OSError:
+    DISK_CACHE_DIR = Path(tempfile.mkdtemp(prefix="sismos-solemne-"))
+
+_SESSION = CachedSession(
+    cache_name=str(DISK_CACHE_DIR / "sismos_http_cache"), backend="sqlite",
+    expire_after=120, allowable_codes=[200], allowable_methods=["GET"], stale_if_error=True,
+    urls_expire_after={"api.gael.cloud": 60, "chilealerta.com": 60,
+                       "www.sismologia.cl": 600, "evtdb.csn.uchile.cl": 600},
+)
+_SESSION.headers.update({"Accept-Encoding": "gzip, deflate", "User-Agent": "sismos-solemne/1.0"})
+_ADAPTER = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                       max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504]))
+_SESSION.mount("http://", _ADAPTER); _SESSION.mount("https://", _ADAPTER)
+
+CACHE_TTL = 60
+CACHE_STALE_TTL = 3600
+_CACHE: dict = {}
+_VALIDATED: dict = {}
+MERGE_WAIT = 3
+PARTIAL_TTL = 10
+DISK_CACHE_TTL = 300
+
+EVTDB_BASE = "https://evtdb.csn.uchile.cl/"
+_QS_INT = re.compile(r"[?&][^=&#]*=(\d+)(?=[&#]|$)")
+_XPATH_NS = {"re": "http://exslt.org/regular-expressions"}
+_EVTDB_ANCHORS = etree.XPath(
+    "//a[re:test(normalize-space(.), '^\\d{4}-\\d{2}-\\d{2} \\d{2}:\\d{2}:\\d{2}$')]", namespaces=_XPATH_NS
+)
+_EVTDB_ROW = re.compile(
+    r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+(-?\d+(?:\.\d+)?)\s+(-?\d+(?:\.\d+)?)\s+(\d+)\s+(\d+(?:\.\d+)?)"
+)
+_EVTDB_NEXT = etree.XPath("//a[normalize-space(.)='[Siguiente]']/@href")
+
+_CSN_PAT = re.compile(
+    r"(?P<local>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}).*?"
+    r"(?P<lugar>[^\n]{1,120}?)\s+(?P<utc>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+"
+    r"(?P<lat>-?\d+\.\d+)\s+\n\s*(?P<lon>-?\d+\.\d+)\s+"
+    r"(?P<prof>\d+)\s+km\s+(?P<mag>[\d\.]+)\s+[A-Za-z]+"
+)
+_HTML_SPLIT = re.compile(r"<!--.*?-->|<script\b.*?</script\s*>|<style\b.*?</style\s*>|<[^>]+>", re.S | re.I)
+
+_FECHA_FMT = "%Y-%m-%d %H:%M:%S"
+_FECHA_FMTS = ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%dT%H:%M:%SZ", "%d/%m/%Y %H:%M:%S", _FECHA_FMT)
+
+_HHMM = _np.array([f"{h:02d}:{m:02d}" for h in range(24) for m in range(60)], dtype=object)
+
 STANDARD_COLS = ['fecha_dt','fecha_local','magnitud','profundidad','latitud','longitud','referencia']
 
-_float_pat = re.compile(r"[-+]?\d+(?:[\.,]\d+)?")
-def _to_float(x):
-    if x is None: return None
-    s = str(x); m = _float_pat.search(s)
-    if not m: return None
-    return float(m.group(0).replace(",", "."))
+_FLOAT_PAT = re.compile(r"([-+]?\d+(?:[.,]\d+)?)")
+
+def _to_float_series(s: pd.Series) -> pd.Series:
+    num = s.astype(str).str.extract(_FLOAT_PAT, expand=False).str.replace(",", ".", regex=False)
+    return pd.to_numeric(num, errors="coerce").astype("float64")
+
+def _parse_fechas(s: pd.Series) -> pd.Series:
+    # one C-level parse per known format, each only over rows still unparsed
+    out = _nat(s.index)
+    pend = s.notna().to_numpy()
+    for fmt in _FECHA_FMTS:
+        if not pend.any(): return out
+        out.loc[pend] = pd.to_datetime(s[pend], format=fmt, utc=True, errors="coerce")
+        pend = pend & out.isna().to_numpy()
+    if pend.any():
+        out.loc[pend] = pd.to_datetime(s[pend], format="mixed", utc=True, errors="coerce")
+    return out
+
+def _newest_first(df: pd.DataFrame) -> pd.DataFrame:
+    v = df['fecha_dt'].values
+    if v.dtype.kind != 'M':
+        return df.sort_values('fecha_dt', ascending=False).reset_index(drop=True)
+    key = v.view('i8')  # NaT is int64 min, so it lands last
+    if (_np.diff(key) <= 0).all():
+        return df.reset_index(drop=True)
+    return df.take(_np.argsort(~key, kind='stable')).reset_index(drop=True)
 
 def _ensure_standard(df: pd.DataFrame) -> pd.DataFrame:
     if df is None or df.empty:
@@ -25,70 +105,97 @@ def _ensure_standard(df: pd.DataFrame) -> pd.DataFrame:
     for c in STANDARD_COLS:
         if c not in df.columns:
             df[c] = _np.nan
-    return df[STANDARD_COLS].sort_values('fecha_dt', ascending=False).reset_index(drop=True)
+    return _newest_first(df[STANDARD_COLS])
+
+def _nat(index: pd.Index) -> pd.Series:
+    return pd.Series(pd.NaT, index=index, dtype="datetime64[ns, UTC]")
+
+def _standard_frame(fecha_dt: pd.Series, magnitud=_np.nan, profundidad=_np.nan,
+                    latitud=_np.nan, longitud=_np.nan, referencia="") -> pd.DataFrame:
+    if len(fecha_dt) == 0:
+        return _ensure_standard(None)
+    df = pd.DataFrame({
+        'fecha_dt': fecha_dt, 'fecha_local': fecha_dt.dt.tz_convert("America/Santiago"),
+        'magnitud': magnitud, 'profundidad': profundidad,
+        'latitud': latitud, 'longitud': longitud, 'referencia': referencia,
+    })
+    return _newest_first(df)
+
+def _html_text(doc: str) -> str:
+    parts = _HTML_SPLIT.split(doc)
+    return "\n".join(t for t in (html.unescape(p).strip() for p in parts) if t)
+
+def _evtdb_url(link: str) -> str:
+    return link if link.startswith("http") else (EVTDB_BASE.rstrip("/") + "/" + link.lstrip("/"))
+
+def _evtdb_page(url: str, timeout: int) -> tuple:
+    r = _SESSION.get(url, timeout=timeout); r.raise_for_status()
+    doc = lxml.html.fromstring(r.content)
+    rows, seen = [], set()
+    for a in _EVTDB_ANCHORS(doc):
+        parent = a.getparent()
+        if parent in seen: continue
+        seen.add(parent)
+        for m in _EVTDB_ROW.finditer(" ".join(parent.itertext())):
+            rows.append((m.group(1), float(m.group(2)), float(m.group(3)), float(m.group(4)), float(m.group(5))))
+    hrefs = _EVTDB_NEXT(doc)
+    return rows, (_evtdb_url(hrefs[0]) if hrefs else None)
+
+def _evtdb_guess(next_url: str, n: int) -> list:
+    # next_url is page 2; only guess when a single numeric query parameter can be the
+    # page index or row offset, otherwise every extra guess would be a wasted request
+    ms = list(_QS_INT.finditer(next_url))
+    if len(ms) != 1: return []
+    m = ms[0]
+    k = int(m.group(1)); step = 1 if k <= 2 else k
+    return [next_url[:m.start(1)] + str(k + step * j) + next_url[m.end(1):] for j in range(n)]
 
 def fetch_from_evtdb(pages: int = 2, timeout: int = 20) -> pd.DataFrame:
-    base = "https://evtdb.csn.uchile.cl/"
-    rows = []; url = base
-    for _ in range(max(1, int(pages))):
-        r = requests.get(url, timeout=timeout); r.raise_for_status()
-        soup = BeautifulSoup(r.text, 'lxml')
-        for a in soup.find_all('a'):
-            txt = a.get_text(strip=True)
-            if re.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", txt):
-                tail = a.find_parent().get_text(" ", strip=True)
-                m = re.search(rf"{re.escape(txt)}\s+(-?\d+(?:\.\d+)?)\s+(-?\d+(?:\.\d+)?)\s+(\d+)\s+(\d+(?:\.\d+)?)", tail)
-                if m:
-                    rows.append({
-                        "fecha": txt,
-                        "latitud": float(m.group(1)),
-                        "longitud": float(m.group(2)),
-                        "profundidad": float(m.group(3)),
-                        "magnitud": float(m.group(4)),
-                        "referencia": "",
-                    })
-        next_link = None
-        for a in soup.find_all('a'):
-            if a.get_text(strip=True) == "[Siguiente]":
-                next_link = a.get('href'); break
-        if not next_link: break
-        url = next_link if next_link.startswith("http") else (base.rstrip("/") + "/" + next_link.lstrip("/"))
-    if not rows:
+    pages = max(1, int(pages))
+    rows, url = _evtdb_page(EVTDB_BASE, timeout); results = [rows]
+    guesses = _evtdb_guess(url, pages - 1) if pages > 1 and url else []
+    if guesses:
+        pool = ThreadPoolExecutor(max_workers=min(len(guesses), 8))
+        futs = {pool.submit(_evtdb_page, u, timeout): u for u in guesses}
+        ready = {}
+        try:
+            # follow the real next links through pages as they land; stop on a wrong guess
+            for fut in as_completed(futs):
+                if fut.exception() is None: ready[futs[fut]] = fut.result()
+                while url in ready and len(results) < pages:
+                    rows, url = ready.pop(url); results.append(rows)
+                if len(results) >= pages or url not in guesses: break
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    while url and len(results) < pages:
+        rows, url = _evtdb_page(url, timeout); results.append(rows)
+    filas = [f for rows in results for f in rows]
+    if not filas:
         return _ensure_standard(pd.DataFrame())
-    df = pd.DataFrame(rows)
-    df["fecha_dt"] = pd.to_datetime(df["fecha"], utc=True, errors="coerce")
-    df["fecha_local"] = df["fecha_dt"].dt.tz_convert("America/Santiago")
-    df["dia"] = df["fecha_local"].dt.date
-    df["hora"] = df["fecha_local"].dt.strftime("%H:%M")
-    df["referencia"] = df.get("referencia", "")
-    return _ensure_standard(df[['fecha_dt','fecha_local','magnitud','profundidad','latitud','longitud','referencia']])
+    fechas, lats, lons, profs, mags = zip(*filas)
+    return _standard_frame(
+        pd.to_datetime(pd.Series(fechas), format=_FECHA_FMT, utc=True, errors="coerce"),
+        magnitud=_np.asarray(mags, dtype=_np.float64), profundidad=_np.asarray(profs, dtype=_np.float64),
+        latitud=_np.asarray(lats, dtype=_np.float64), longitud=_np.asarray(lons, dtype=_np.float64),
+    )
 
 def fetch_from_csn(date: Optional[_dt.date] = None, timeout: int = 20) -> pd.DataFrame:  # noqa: C901
     if date is None:
         date = _dt.datetime.now(tz=pd.Timestamp.now(tz='America/Santiago').tz).date()
     y = date.strftime('%Y'); m = date.strftime('%m'); d = date.strftime('%Y%m%d')
     url = f"https://www.sismologia.cl/sismicidad/catalogo/{y}/{m}/{d}.html"
-    r = requests.get(url, timeout=timeout); r.raise_for_status()
-    soup = BeautifulSoup(r.text, 'lxml'); text = soup.get_text('\n', strip=True)
-
-    pat = re.compile(
-        r"(?P<local>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}).*?"
-        r"(?P<lugar>[^\n]+?)\s+(?P<utc>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\s+"
-        r"(?P<lat>-?\d+\.\d+)\s+\n\s*(?P<lon>-?\d+\.\d+)\s+"
-        r"(?P<prof>\d+)\s+km\s+(?P<mag>[\d\.]+)\s+[A-Za-z]+"
-    )
-    rows = []
-    for m in pat.finditer(text):
-        rows.append({
-            'fecha_local_str': m.group('local'), 'fecha_utc_str': m.group('utc'),
-            'referencia': m.group('lugar'),
-            'latitud': float(m.group('lat')), 'longitud': float(m.group('lon')),
-            'profundidad': float(m.group('prof')), 'magnitud': float(m.group('mag')),
-        })
-
-    if not rows:
+    r = _SESSION.get(url, timeout=timeout); r.raise_for_status()
+    text = _html_text(r.text)
+
+    utcs, refs, lats, lons, profs, mags = [], [], [], [], [], []
+    for m in _CSN_PAT.finditer(text):
+        utcs.append(m.group('utc')); refs.append(m.group('lugar'))
+        lats.append(float(m.group('lat'))); lons.append(float(m.group('lon')))
+        profs.append(float(m.group('prof'))); mags.append(float(m.group('mag')))
+
+    if not utcs:
         try:
-            tables = pd.read_html(url, flavor='lxml')
+            tables = pd.read_html(io.StringIO(r.text), flavor='lxml')
             for t in tables:
                 cols = [str(c).strip().lower() for c in t.columns]
                 if any("lat" in c for c in cols) and any(("lon" in c or "long" in c or "longitud" in c) for c in cols):
@@ -100,29 +207,39 @@ def fetch_from_csn(date: Optional[_dt.date] = None, timeout: int = 20) -> pd.Dat
                     col_lat = pick(["latitud","lat"]); col_lon = pick(["longitud","lon","long"])
                     col_prof = pick(["profundidad","prof","depth"]); col_mag = pick(["magnitud","mag"])
                     col_fecha = pick(["fecha","utc","datetime","hora"])
-                    df = pd.DataFrame()
-                    if col_fecha is not None: df['fecha_dt'] = pd.to_datetime(t[col_fecha], utc=True, errors='coerce')
-                    if col_lat is not None: df['latitud'] = pd.to_numeric(t[col_lat], errors='coerce')
-                    if col_lon is not None: df['longitud'] = pd.to_numeric(t[col_lon], errors='coerce')
-                    if col_prof is not None: df['profundidad'] = pd.to_numeric(t[col_prof], errors='coerce')
-                    if col_mag is not None: df['magnitud'] = pd.to_numeric(t[col_mag], errors='coerce')
-                    df['fecha_local'] = df.get('fecha_dt', pd.NaT).dt.tz_convert('America/Santiago')
-                    df['referencia'] = ""
-                    return _ensure_standard(df)
+                    def num(c):
+                        return _np.nan if c is None else pd.to_numeric(t[c], errors='coerce')
+                    return _standard_frame(
+                        _nat(t.index) if col_fecha is None else _parse_fechas(t[col_fecha]),
+                        magnitud=num(col_mag), profundidad=num(col_prof),
+                        latitud=num(col_lat), longitud=num(col_lon),
+                    )
         except Exception:
             pass
         return _ensure_standard(pd.DataFrame())
 
-    df = pd.DataFrame(rows)
-    df['fecha_dt'] = pd.to_datetime(df['fecha_utc_str'], utc=True, errors="coerce")
-    df['fecha_local'] = pd.to_datetime(df['fecha_local_str'], utc=False, errors="coerce").dt.tz_localize('America/Santiago')
-    df['dia'] = df['fecha_local'].dt.date
-    df['hora'] = df['fecha_local'].dt.strftime('%H:%M')
-    return _ensure_standard(df[['fecha_dt','fecha_local','magnitud','profundidad','latitud','longitud','referencia']])
+    return _standard_frame(
+        pd.to_datetime(pd.Series(utcs), format=_FECHA_FMT, utc=True, errors="coerce"),
+        magnitud=_np.asarray(mags, dtype=_np.float64), profundidad=_np.asarray(profs, dtype=_np.float64),
+        latitud=_np.asarray(lats, dtype=_np.float64), longitud=_np.asarray(lons, dtype=_np.float64),
+        referencia=refs,
+    )
 
-def fetch_from_chilealerta(timeout: int = 20) -> pd.DataFrame:
-    r = requests.get(CHILEALERTA_ENDPOINT, timeout=timeout); r.raise_for_status()
-    data = r.json()
+def _conditional_frame(url: str, timeout: int, parse) -> pd.DataFrame:
+    # reuse the last parsed frame while the feed's ETag / Last-Modified is unchanged
+    prev = _VALIDATED.get(url); headers = {}
+    if prev is not None:
+        if prev[0]: headers["If-None-Match"] = prev[0]
+        if prev[1]: headers["If-Modified-Since"] = prev[1]
+    r = _SESSION.get(url, timeout=timeout, headers=headers); r.raise_for_status()
+    validators = (r.headers.get("ETag"), r.headers.get("Last-Modified"))
+    if prev is not None and (r.status_code == 304 or (any(validators) and validators == prev[:2])):
+        return prev[2].copy()
+    df = parse(_json_loads(r.content))
+    if any(validators): _VALIDATED[url] = (*validators, df)
+    return df.copy()
+
+def _parse_chilealerta(data) -> pd.DataFrame:
     if isinstance(data, list): raw = data
     elif isinstance(data, dict):
         raw = None
@@ -135,73 +252,197 @@ def fetch_from_chilealerta(timeout: int = 20) -> pd.DataFrame:
     df = pd.json_normalize(raw)
     if df.empty: return _ensure_standard(df)
 
+    lc = [str(c).lower() for c in df.columns]
     def pickcol(patterns):
         for p in patterns:
-            cols = [c for c in df.columns if p.lower() in c.lower()]
-            if cols: return cols[0]
+            j = next((j for j, c in enumerate(lc) if p in c), None)
+            if j is not None: return df.columns[j]
         return None
     col_lat = pickcol(["lat"]); col_lon = pickcol(["lon","long"])
     col_prof = pickcol(["prof","depth"]); col_mag = pickcol(["mag"])
     col_fecha = pickcol(["fecha","time","date"])
+    if col_fecha is None and col_lat is None and col_lon is None:
+        return _ensure_standard(pd.DataFrame())
+
+    def num(c):
+        return _np.nan if c is None else _to_float_series(df[c])
+    return _standard_frame(
+        _nat(df.index) if col_fecha is None else _parse_fechas(df[col_fecha]),
+        magnitud=num(col_mag), profundidad=num(col_prof), latitud=num(col_lat), longitud=num(col_lon),
+    )
 
-    out = pd.DataFrame()
-    if col_fecha: out['fecha_dt'] = pd.to_datetime(df[col_fecha], utc=True, errors="coerce")
-    if col_lat:   out['latitud'] = df[col_lat].apply(_to_float)
-    if col_lon:   out['longitud'] = df[col_lon].apply(_to_float)
-    if col_prof:  out['profundidad'] = df[col_prof].apply(_to_float)
-    if col_mag:   out['magnitud'] = df[col_mag].apply(_to_float)
-    out['fecha_local'] = out.get('fecha_dt', pd.NaT).dt.tz_convert("America/Santiago")
-    out['referencia'] = ""
-    out['dia'] = out['fecha_local'].dt.date
-    out['hora'] = out['fecha_local'].dt.strftime('%H:%M')
-    return _ensure_standard(out)
+def fetch_from_chilealerta(timeout: int = 20) -> pd.DataFrame:
+    return _conditional_frame(CHILEALERTA_ENDPOINT, timeout, _parse_chilealerta)
+
+def _parse_gael(data) -> pd.DataFrame:
+    if not isinstance(data, list) or not data: return _ensure_standard(pd.DataFrame())
+    df = pd.DataFrame(data)
+    df.columns = df.columns.astype(str).str.lower()
+    df = df.loc[:, ~df.columns.duplicated()]
+    num = {k: _to_float_series(df[k]) for k in ["latitud","longitud","profundidad","magnitud"] if k in df.columns}
+    return _standard_frame(
+        _parse_fechas(df['fecha']) if 'fecha' in df.columns else _nat(df.index),
+        referencia=df['referencia'] if 'referencia' in df.columns else "", **num,
+    )
 
 def fetch_from_gael(timeout: int = 20) -> pd.DataFrame:
-    r = requests.get(GAEL_ENDPOINT, timeout=timeout); r.raise_for_status()
-    data = r.json()
-    if not isinstance(data, list): return _ensure_standard(pd.DataFrame())
-    df = pd.DataFrame([{k.lower(): v for k, v in d.items()} for d in data])
-    for k in ["latitud","longitud","profundidad","magnitud"]:
-        if k in df.columns:
-            df[k] = df[k].apply(_to_float)
-    df['fecha_dt'] = pd.to_datetime(df.get('fecha', _np.nan), utc=True, errors="coerce")
-    df['fecha_local'] = df['fecha_dt'].dt.tz_convert("America/Santiago")
-    df['referencia'] = df.get('referencia', "")
-    df['dia'] = df['fecha_local'].dt.date
-    df['hora'] = df['fecha_local'].dt.strftime('%H:%M')
-    return _ensure_standard(df[['fecha_dt','fecha_local','magnitud','profundidad','latitud','longitud','referencia']])
-
-def fetch_sismos(evtdb_pages: int = 2, timeout: int = 20) -> pd.DataFrame:
+    return _conditional_frame(GAEL_ENDPOINT, timeout, _parse_gael)
+
+def add_dia_hora(df: pd.DataFrame) -> pd.DataFrame:
+    if df["fecha_local"].dtype.kind != "M":  # e.g. the object-dtype empty standard frame
+        return df.assign(dia=pd.Series(pd.NaT, index=df.index, dtype="datetime64[s]"),
+                         hora=pd.Series(None, index=df.index, dtype=object))
+    wall = df["fecha_local"].dt.tz_localize(None).values  # local wall-clock datetime64
+    dia = wall.astype("datetime64[D]")
+    ok = ~_np.isnat(wall)
+    minuto = _np.where(ok, (wall - dia).astype("timedelta64[m]").view(_np.int64), 0)
+    return df.assign(dia=pd.Series(dia, index=df.index),
+                     hora=pd.Series(_np.where(ok, _HHMM[minuto], None), index=df.index))
+
+def _dedup(df: pd.DataFrame) -> pd.DataFrame:
+    key = pd.DataFrame({
+        "t": df["fecha_dt"].dt.floor("min"),
+        "lat": (df["latitud"] * 100).round(),
+        "lon": (df["longitud"] * 100).round(),
+    })
+    return df.loc[~key.duplicated().to_numpy()].reset_index(drop=True)
+
+# queried concurrently; fetch_sismos merges whatever answered within MERGE_WAIT of the
+# first source with rows (later ones are missing, see attrs["partial"]), and on
+# duplicates among those the earlier source's row is kept. Each entry is called as
+# fn(evtdb_pages, timeout); only sources that paginate use the page count.
+SOURCES = {
+    "evtdb": lambda pages, timeout: fetch_from_evtdb(pages=pages, timeout=timeout),
+    "csn": lambda pages, timeout: fetch_from_csn(timeout=timeout),
+    "chilealerta": lambda pages, timeout: fetch_from_chilealerta(timeout=timeout),
+    "gael": lambda pages, timeout: fetch_from_gael(timeout=timeout),
+}
+
+def _has_rows(fut) -> bool:
+    return fut.done() and not fut.cancelled() and fut.exception() is None and not fut.result().empty
+
+def _fetch_sismos_uncached(evtdb_pages: int, timeout: int, source: str = "auto") -> pd.DataFrame:
+    if source != "auto":
+        return SOURCES[source](evtdb_pages, timeout)
+    pool = ThreadPoolExecutor(max_workers=len(SOURCES))
+    futs = [pool.submit(fn, evtdb_pages, timeout) for fn in SOURCES.values()]
     try:
-        df = fetch_from_evtdb(pages=evtdb_pages, timeout=timeout)
-        if not df.empty: return df
-    except Exception:
-        pass
+        # wait for the first source with data, then give the rest MERGE_WAIT seconds
+        pending = set(futs)
+        while pending and not any(_has_rows(f) for f in futs):
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+        if pending:
+            wait(pending, timeout=MERGE_WAIT)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+    frames = [f.result() for f in futs if _has_rows(f)]
+    if not frames:
+        errors = [f.exception() for f in futs if f.done() and f.exception() is not None]
+        if len(errors) == len(futs): raise errors[-1]
+        return _ensure_standard(pd.DataFrame())
+    df = _ensure_standard(_dedup(pd.concat(frames, ignore_index=True)))
+    if not all(f.done() for f in futs):
+        df.attrs["partial"] = True
+    return df
+
+def _stale(entry: Optional[dict], now: float) -> Optional[pd.DataFrame]:
+    if entry is None or now >= entry["stale_ts"]:
+        return None
+    df = entry["df"].copy(); df.attrs["stale"] = True
+    return df
+
+def _disk_path(source: str, evtdb_pages: int) -> Path:
+    return DISK_CACHE_DIR / f"sismos_cache_{source}_{evtdb_pages}.parquet"
+
+def _read_disk(path: Path, now: float) -> Optional[tuple]:
     try:
-        df = fetch_from_csn(timeout=timeout)
-        if not df.empty: return df
-    except Exception:
+        mtime = path.stat().st_mtime
+        if now - mtime < DISK_CACHE_TTL:
+            return pd.read_parquet(path), mtime
+    except (OSError, ImportError, ValueError):
         pass
+    return None
+
+def _write_disk(path: Path, df: pd.DataFrame) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp"); os.close(fd)
     try:
-        df = fetch_from_chilealerta(timeout=timeout)
-        if not df.empty: return df
+        df.to_parquet(tmp, compression="zstd", index=False); os.replace(tmp, path)
+    except (OSError, ImportError, ValueError):
+        if os.path.exists(tmp): os.remove(tmp)
+
+def fetch_sismos(evtdb_pages: int = 2, timeout: int = 20, source: str = "auto") -> pd.DataFrame:
+    if source != "auto" and source not in SOURCES:
+        raise ValueError(f"fuente desconocida: {source!r} (opciones: auto, {', '.join(SOURCES)})")
+    key = (source, evtdb_pages); now = time.time(); entry = _CACHE.get(key)
+    if entry is not None and now - entry["ts"] < entry["ttl"]:
+        return entry["df"].copy()
+    path = _disk_path(source, evtdb_pages)
+    # the disk tier only warms a cold process; an expired in-memory entry means refetch
+    hit = _read_disk(path, now) if entry is None else None
+    if hit is not None:
+        df, mtime = hit
+        _CACHE[key] = {"df": df, "ts": now, "ttl": min(CACHE_TTL, mtime + DISK_CACHE_TTL - now),
+                       "stale_ts": mtime + CACHE_STALE_TTL}
+        return df.copy()
+    try:
+        df = _fetch_sismos_uncached(evtdb_pages, timeout, source)
     except Exception:
-        pass
-    return fetch_from_gael(timeout=timeout)
+        df = _stale(entry, now)
+        if df is None: raise
+        return df
+    if df.empty:
+        stale = _stale(entry, now)
+        return df if stale is None else stale
+    # a merge missing slow sources is only held briefly so the next call can complete it
+    partial = df.attrs.get("partial", False)
+    _CACHE[key] = {"df": df, "ts": now, "ttl": PARTIAL_TTL if partial else CACHE_TTL,
+                   "stale_ts": now + CACHE_STALE_TTL}
+    if not partial: _write_disk(path, df)
+    return df.copy()
+
+def _cache_clear() -> None:
+    # drop every tier: in-memory frames, Parquet snapshots and the HTTP cache
+    _CACHE.clear(); _VALIDATED.clear()
+    for p in DISK_CACHE_DIR.glob("sismos_cache_*.parquet"):
+        try:
+            p.unlink()
+        except OSError:
+            pass
+    _SESSION.cache.clear()
+
+fetch_sismos.cache_clear = _cache_clear
+
+def _utc64(t) -> _np.datetime64:
+    t = pd.Timestamp(t)
+    return (t.tz_convert(None) if t.tz is not None else t).to_datetime64()
+
+def _fecha_slice(fechas: pd.Series, desde, hasta) -> Optional[slice]:
+    # fetch_sismos returns rows newest-first; binary search the reversed view
+    if not fechas.is_monotonic_decreasing:
+        return None
+    asc = fechas.values[::-1]; n = len(asc)
+    lo = 0 if desde is None else int(_np.searchsorted(asc, _utc64(desde), side="left"))
+    hi = n if hasta is None else int(_np.searchsorted(asc, _utc64(hasta), side="right"))
+    return slice(n - hi, n - lo) if hi > lo else slice(0, 0)
 
 def filter_sismos(df: pd.DataFrame,
                   mag_min: Optional[float] = None,
                   fecha_desde: Optional[pd.Timestamp] = None,
                   fecha_hasta: Optional[pd.Timestamp] = None,
                   region_keyword: str = "") -> pd.DataFrame:
-    out = df.copy()
+    if fecha_desde is not None or fecha_hasta is not None:
+        sl = _fecha_slice(df["fecha_dt"], fecha_desde, fecha_hasta)
+        if sl is not None:
+            df = df.iloc[sl]; fecha_desde = fecha_hasta = None
+    mask = _np.ones(len(df), dtype=bool)
     if mag_min is not None:
-        out = out[(out["magnitud"].fillna(-999) >= mag_min)]
+        mask &= df["magnitud"].to_numpy(dtype="f8", na_value=-_np.inf) >= mag_min
     if fecha_desde is not None:
-        out = out[out["fecha_dt"] >= fecha_desde]
+        mask &= (df["fecha_dt"] >= fecha_desde).to_numpy()
     if fecha_hasta is not None:
-        out = out[out["fecha_dt"] <= fecha_hasta]
+        mask &= (df["fecha_dt"] <= fecha_hasta).to_numpy()
     if region_keyword:
-        rk = region_keyword.strip().lower()
-        out = out[out["referencia"].astype(str).str.lower().str.contains(rk, na=False)]
-    return out.reset_index(drop=True)
+        codes, uniq = pd.factorize(df["referencia"])
+        hit = uniq.astype(str).str.contains(region_keyword.strip(), case=False, regex=False)
+        mask &= _np.append(_np.asarray(hit, dtype=bool), False)[codes]
+    return df[mask].reset_index(drop=True)
@@ -0,0 +1,29 @@
+import unittest
+
+import pandas as pd
+
+from src.api import STANDARD_COLS, _ensure_standard, add_dia_hora
+
+
+class EnsureStandardTest(unittest.TestCase):
+    def test_object_fecha_dt_sorts_newest_first(self):
+        df = pd.DataFrame({"fecha_dt": ["2024-01-01 10:00:00", "2024-01-02 10:00:00"], "latitud": [1.0, 2.0]},
+                          dtype=object)
+        out = _ensure_standard(df)
+        self.assertEqual(list(out.columns), STANDARD_COLS)
+        self.assertEqual(out["latitud"].tolist(), [2.0, 1.0])
+
+    def test_missing_fecha_dt(self):
+        out = _ensure_standard(pd.DataFrame({"latitud": [1.0]}))
+        self.assertEqual(len(out), 1)
+
+
+class AddDiaHoraTest(unittest.TestCase):
+    def test_empty_standard_frame(self):
+        out = add_dia_hora(_ensure_standard(None))
+        self.assertTrue(out.empty)
+        self.assertEqual(out["dia"].dtype.kind, "M")
+
+
+if __name__ == "__main__":
+    unittest.main()